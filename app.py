@@ -1,23 +1,92 @@
+import json
 import os
-from flask import Flask, request, flash, render_template, redirect, url_for
-from dotenv import load_dotenv
-import requests
-from config.logging_config import setup_logging
+import threading
+import time
+import click
+from flask import (Blueprint, Flask, current_app, request, flash, render_template, redirect, url_for,
+                   jsonify)
+from flask.cli import AppGroup
+from werkzeug.local import LocalProxy
 from config.config import Config
-from datamanager.sqlite_data_manager import SQLiteDataManager
 
 
-load_dotenv()
-API_KEY = os.getenv('API_KEY')
+bp = Blueprint('main', __name__)
+changes_cli = AppGroup('changes', help='Read and compact the change log.')
 
-app = Flask(__name__)
-app.config.from_object(Config)
+# The data manager lives on the app created by create_app(),
+# views reach it through this proxy so importing this module stays free of side effects
+data_manager = LocalProxy(lambda: current_app.extensions['data_manager'])
 
-# initialize an instance of SQLiteDataManager with the Flask app
-data_manager = SQLiteDataManager(app)
+# Result of the last OMDb reachability check, shared by the threads of one worker
+_omdb_status = {'checked_at': 0.0, 'reachable': None, 'checking': False}
+_omdb_status_lock = threading.Lock()
 
-# Set up logging
-setup_logging(app)
+
+class InFlightCounter:
+    """
+    Count the requests a worker is currently serving, so /readyz can report a busy worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def increment(self):
+        with self._lock:
+            self.value += 1
+
+    def decrement(self):
+        with self._lock:
+            self.value -= 1
+
+
+def create_app(config=None):
+    """
+    Create and configure the Flask application.
+    Heavy imports and the database schema check happen here rather than at import time,
+    so a preforking server can import this module cheaply and build the app once.
+    Args:
+        config (dict, optional): Settings that override the defaults from Config.
+    Returns:
+        Flask: The configured application.
+    """
+    from dotenv import load_dotenv
+    from config.logging_config import setup_logging
+    from datamanager.sqlite_data_manager import SQLiteDataManager
+    from static_assets import init_static_assets
+    from template_cache import init_template_cache, warm_template_cache
+
+    load_dotenv()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.setdefault('OMDB_API_KEY', os.getenv('API_KEY'))
+    if config:
+        app.config.update(config)
+
+    # Jinja options have to be set before the template environment is first used
+    init_template_cache(app)
+
+    # Set up logging
+    setup_logging(app)
+
+    # initialize an instance of SQLiteDataManager with the Flask app
+    manager = SQLiteDataManager(app)
+    app.extensions['data_manager'] = manager
+    if app.config['SCHEMA_CHECK_ON_STARTUP']:
+        manager.ensure_schema()
+
+    app.extensions['in_flight'] = InFlightCounter()
+
+    # Fingerprinted, precompressed static files and gzipped HTML
+    init_static_assets(app)
+
+    app.register_blueprint(bp)
+    app.cli.add_command(changes_cli)
+
+    if app.config['TEMPLATE_PRECOMPILE']:
+        warm_template_cache(app)
+    return app
 
 
 def fetch_movie_details_from_omdb(title):
@@ -28,12 +97,14 @@ def fetch_movie_details_from_omdb(title):
         if successful.
         None: If the API request fails or the movie is not found.
     """
-    try:
-        # Construct the API URL
-        api_url = f'http://www.omdbapi.com/?apikey={API_KEY}&t={title}'
+    # requests is only needed once a movie is looked up, keep it out of worker startup
+    import requests
 
-        # Send the request to OMDb API
-        response = requests.get(api_url, timeout=5)
+    try:
+        # Send the request to OMDb API, requests encodes the title into the query string
+        response = requests.get(current_app.config['OMDB_API_URL'],
+                                params={'apikey': current_app.config['OMDB_API_KEY'], 't': title},
+                                timeout=current_app.config['OMDB_TIMEOUT'])
         response.raise_for_status()  # Raises an HTTPError if the response status is 4xx, 5xx
 
         data = response.json()
@@ -44,23 +115,209 @@ def fetch_movie_details_from_omdb(title):
                 'release_year': data.get('Year'),
                 'rating': data.get('imdbRating')
             }
-        app.logger.error(f"OMDb API Error: {data.get('Error')}")
+        current_app.logger.error(f"OMDb API Error: {data.get('Error')}")
         return None
 
     except requests.exceptions.HTTPError as http_err:
-        print(f"HTTP error happened: {http_err}")
+        current_app.logger.error(f"OMDb HTTP error happened: {http_err}")
     except requests.exceptions.ConnectionError as conn_err:
-        print(f"Connection error happened: {conn_err}")
+        current_app.logger.error(f"OMDb connection error happened: {conn_err}")
     except requests.exceptions.Timeout as timeout_err:
-        print(f"Timeout error happened: {timeout_err}")
+        current_app.logger.error(f"OMDb timeout error happened: {timeout_err}")
     except requests.exceptions.RequestException as req_err:
-        print(f"An error happened: {req_err}")
+        current_app.logger.error(f"OMDb request error happened: {req_err}")
 
     # Return None for any kind of failure uniformly
     return None
 
 
-@app.route('/')
+def check_omdb_reachable(wait=True):
+    """
+    Check whether the OMDb API answers at all, without spending an API call.
+    The result is cached for OMDB_HEALTH_TTL seconds, so frequent readiness probes
+    do not turn into a request to OMDb each. The lock only guards the cache: while one
+    thread refreshes it, the other probes answer with the previous result instead of waiting.
+    Args:
+        wait (bool): Refresh a stale result before answering. If False, the refresh runs on a
+            background thread and the previous result is returned right away.
+    Returns:
+        bool: True if OMDb responded with a non-5xx status within OMDB_HEALTH_TIMEOUT.
+        None: If wait is False and OMDb has not been checked yet.
+    """
+    ttl = current_app.config['OMDB_HEALTH_TTL']
+    with _omdb_status_lock:
+        previous = _omdb_status['reachable']
+        fresh = time.monotonic() - _omdb_status['checked_at'] < ttl
+        if (previous is not None or not wait) and (fresh or _omdb_status['checking']):
+            return previous
+        _omdb_status['checking'] = True
+
+    app = current_app._get_current_object()
+    if wait:
+        return _refresh_omdb_status(app)
+    threading.Thread(target=_refresh_omdb_status, args=(app,), daemon=True).start()
+    return previous
+
+
+def _refresh_omdb_status(app):
+    """
+    Send the HEAD request behind check_omdb_reachable() and store its result.
+    """
+    import requests
+
+    reachable = False
+    try:
+        response = requests.head(app.config['OMDB_API_URL'], timeout=app.config['OMDB_HEALTH_TIMEOUT'])
+        reachable = response.status_code < 500
+    except requests.exceptions.RequestException as req_err:
+        app.logger.warning(f"OMDb health check failed: {req_err}")
+    finally:
+        # Also on an unexpected error, so the next probe after the TTL checks again
+        with _omdb_status_lock:
+            _omdb_status.update(checked_at=time.monotonic(), reachable=reachable, checking=False)
+    return reachable
+
+
+@bp.before_app_request
+def track_request_start():
+    current_app.extensions['in_flight'].increment()
+
+
+@bp.teardown_app_request
+def track_request_end(exc):
+    current_app.extensions['in_flight'].decrement()
+
+
+@bp.app_template_global()
+def url_pattern(endpoint, *args):
+    """
+    Build the URL of an endpoint once, with '%s' in place of each of the given integer
+    arguments, in the order they appear in the URL. List templates fill it in per row with
+    the '%' operator, which costs a fraction of a url_for() call per row.
+    Args:
+        endpoint (str): The endpoint, as passed to url_for().
+        *args (str): The names of the integer URL arguments, e.g. 'user_id', 'movie_id'.
+    Returns:
+        str: The URL pattern, e.g. '/users/%s/remove_movie/%s'.
+    """
+    # Distinct stand-in ids that cannot be mistaken for any other part of the URL
+    stand_ins = {name: 987654320 + position for position, name in enumerate(args)}
+    pattern = url_for(endpoint, **stand_ins).replace('%', '%%')
+    for value in stand_ins.values():
+        pattern = pattern.replace(str(value), '%s')
+    return pattern
+
+
+@bp.route('/healthz', methods=['GET'])
+def healthz():
+    """
+    Liveness probe: the worker process is up and able to answer requests.
+    """
+    return jsonify(status='ok')
+
+
+@bp.route('/readyz', methods=['GET'])
+def readyz():
+    """
+    Readiness probe for the load balancer.
+    Checks that SQLite answers, that OMDb is reachable (cached) and that the worker
+    is not already saturated.
+    Returns:
+        Response: JSON with the individual checks, status 200 if the worker should receive
+        traffic, 503 otherwise.
+    """
+    # When OMDb does not decide readiness, the probe never waits for it
+    require_omdb = current_app.config['READYZ_REQUIRE_OMDB']
+    checks = {'database': data_manager.ping(), 'omdb': check_omdb_reachable(wait=require_omdb)}
+
+    # This probe is itself counted as in flight
+    in_flight = current_app.extensions['in_flight'].value - 1
+    max_in_flight = current_app.config['READYZ_MAX_IN_FLIGHT']
+    checks['capacity'] = not max_in_flight or in_flight < max_in_flight
+
+    # Without OMDb only adding movies fails, so it only takes the worker out when configured
+    required = ['database', 'capacity'] + (['omdb'] if require_omdb else [])
+    ready = all(checks[name] for name in required)
+
+    return jsonify(status='ok' if ready else 'unavailable', checks=checks,
+                   in_flight=in_flight), 200 if ready else 503
+
+
+@bp.route('/api/changes', methods=['GET'])
+def api_changes():
+    """
+    Incremental sync for downstream consumers, reading the change log in sequence order.
+    Query args:
+        since (int): The last sequence number the consumer has applied, 0 to start from the beginning.
+        limit (int): The maximum number of changes to return, capped at CHANGES_MAX_PAGE_SIZE.
+    Returns:
+        Response: JSON with the changes, 'next_since' to pass on the next call and 'has_more'.
+        Status 400 if 'since' or 'limit' is not a valid number.
+        Status 410 if changes after 'since' were already compacted and the consumer must resync.
+    """
+    try:
+        since = int(request.args.get('since', 0))
+        limit = int(request.args.get('limit', current_app.config['CHANGES_PAGE_SIZE']))
+    except ValueError:
+        return jsonify(error="'since' and 'limit' must be integers."), 400
+    if since < 0 or limit < 1:
+        return jsonify(error="'since' must be 0 or more and 'limit' at least 1."), 400
+    limit = min(limit, current_app.config['CHANGES_MAX_PAGE_SIZE'])
+
+    oldest_seq = data_manager.get_oldest_change_seq()
+    if oldest_seq is not None and since < oldest_seq - 1:
+        return jsonify(error='Changes after this sequence number were compacted, a full resync is required.',
+                       oldest_seq=oldest_seq), 410
+
+    # Fetch one extra entry to tell whether another page follows
+    changes = data_manager.get_changes(since, limit + 1)
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    return jsonify(changes=[change.to_dict() for change in changes],
+                   next_since=changes[-1].seq if changes else since,
+                   has_more=has_more)
+
+
+@changes_cli.command('stream')
+@click.option('--since', default=0, type=click.IntRange(min=0), help='Last sequence number already applied.')
+@click.option('--batch-size', default=500, type=click.IntRange(min=1), help='Changes read per query.')
+@click.option('--follow', is_flag=True, help='Keep polling for new changes.')
+@click.option('--poll-interval', default=2.0, type=float, help='Seconds between polls with --follow.')
+def stream_changes(since, batch_size, follow, poll_interval):
+    """Print the changes after --since as JSON lines."""
+    oldest_seq = data_manager.get_oldest_change_seq()
+    if oldest_seq is not None and since < oldest_seq - 1:
+        raise click.ClickException(f"Changes up to {oldest_seq - 1} were compacted, a full resync is required.")
+
+    while True:
+        changes = [change.to_dict() for change in data_manager.get_changes(since, batch_size)]
+        # End the read transaction, so the next batch sees changes committed in the meantime
+        data_manager.db.session.rollback()
+
+        for change in changes:
+            click.echo(json.dumps(change))
+        if changes:
+            since = changes[-1]['seq']
+
+        if len(changes) < batch_size:
+            if not follow:
+                break
+            time.sleep(poll_interval)
+
+
+@changes_cli.command('compact')
+@click.option('--before-seq', type=click.IntRange(min=1), help='Delete changes with a lower sequence number.')
+@click.option('--older-than-days', type=click.FloatRange(min=0), help='Delete changes older than this many days.')
+def compact_changes(before_seq, older_than_days):
+    """Delete old change log entries, the newest entry is always kept."""
+    if before_seq is None and older_than_days is None:
+        raise click.UsageError('Pass --before-seq and/or --older-than-days.')
+    deleted = data_manager.compact_changes(before_seq=before_seq, older_than_days=older_than_days)
+    click.echo(f"Deleted {deleted} change log entries.")
+
+
+@bp.route('/')
 def home():
     """
     Render the home page.
@@ -68,7 +325,7 @@ def home():
     return render_template('home.html')
 
 
-@app.route('/users', methods=['GET'])
+@bp.route('/users', methods=['GET'])
 def list_users():
     """
     Display the list of all users.
@@ -81,13 +338,13 @@ def list_users():
         return render_template('users.html', users=users)
 
     except Exception as e:
-        app.logger.error(f"Error fetching users from the database: {e}")
+        current_app.logger.error(f"Error fetching users from the database: {e}")
         flash('An error occurred while fetching users. Please try again later. 🛀',
               'error')
-        return redirect(url_for('home'))
+        return redirect(url_for('main.home'))
 
 
-@app.route('/movies', methods=['GET'])
+@bp.route('/movies', methods=['GET'])
 def list_movies():
     """
     Display the list of all movies.
@@ -100,13 +357,13 @@ def list_movies():
         return render_template('movies.html', movies=movies)
 
     except Exception as e:
-        app.logger.error(f"Error fetching movies from the database: {e}")
+        current_app.logger.error(f"Error fetching movies from the database: {e}")
         flash('An error occurred while fetching movies. Please try again later. 🫀',
               'error')
-        return redirect(url_for('home'))
+        return redirect(url_for('main.home'))
 
 
-@app.route('/add_user', methods=['GET', 'POST'])
+@bp.route('/add_user', methods=['GET', 'POST'])
 def add_user():
     """
     Add a new user to the database.
@@ -129,7 +386,7 @@ def add_user():
             else:
                 flash('Failed to add user. Please try again later. 🦖', 'error')
 
-            return redirect(url_for('add_user'))
+            return redirect(url_for('main.add_user'))
 
         else:
             flash('User name is required and cannot be empty! 🧉', 'error')
@@ -138,7 +395,7 @@ def add_user():
     return render_template('add_user.html')
 
 
-@app.route('/add_movie', methods=['GET', 'POST'])
+@bp.route('/add_movie', methods=['GET', 'POST'])
 def add_movie():
     """
     Add a new movie to the database.
@@ -162,7 +419,7 @@ def add_movie():
                 # Use the initial input title when the API fails to fetch movie data
                 flash(f"Could not fetch details for the movie '{title}' from OMDb. 🦈",
                       'error')
-                return redirect(url_for('add_movie'))
+                return redirect(url_for('main.add_movie'))
 
             try:
                 # Add the movie to the database
@@ -176,7 +433,7 @@ def add_movie():
                     flash(f"Failed to add movie '{movie_data['title']}'. 🪗", 'error')
 
             except Exception as e:
-                app.logger.error(f"Error adding movie: {e}")
+                current_app.logger.error(f"Error adding movie: {e}")
                 flash(f"An unexpected error occurred while adding the movie '{title}'. 💣",
                       'error')
 
@@ -184,12 +441,12 @@ def add_movie():
             flash("Movie title cannot be empty or whitespace. Please enter a valid title. 🧯",
                   'error')
 
-        return redirect(url_for('list_movies'))
+        return redirect(url_for('main.list_movies'))
 
     return render_template('add_movie.html', movie_data={})
 
 
-@app.route('/users/<int:user_id>', methods=['GET'])
+@bp.route('/users/<int:user_id>', methods=['GET'])
 def user_movies(user_id):
     """
     Display the movies associated with a specific user.
@@ -207,12 +464,12 @@ def user_movies(user_id):
 
     if not user:
         flash(f'User with ID {user_id} is not found. 🍭', 'error')
-        return redirect('/users')
+        return redirect(url_for('main.list_users'))
 
     return render_template('user_movies.html', user=user, movies=movies)
 
 
-@app.route('/users/<int:user_id>/add_new_movie', methods=['GET', 'POST'])
+@bp.route('/users/<int:user_id>/add_new_movie', methods=['GET', 'POST'])
 def add_new_movie_to_user(user_id):
     """
     Add a new movie to a specific user by fetching movie details from OMDb.
@@ -231,7 +488,7 @@ def add_new_movie_to_user(user_id):
 
         if not user:
             flash(f"User with ID {user_id} not found. 💎", 'error')
-            return redirect(url_for('list_users'))
+            return redirect(url_for('main.list_users'))
 
         if request.method == 'POST':
             title = request.form.get('title')
@@ -242,7 +499,7 @@ def add_new_movie_to_user(user_id):
                 if not movie_data:
                     flash(f"Could not fetch details for the movie '{title}' from OMDb. 🚰",
                           'error')
-                    return redirect(url_for('add_new_movie_to_user', user_id=user_id))
+                    return redirect(url_for('main.add_new_movie_to_user', user_id=user_id))
 
                 # Add the movie to the database
                 movie_id = data_manager.add_movie(movie_data)
@@ -262,19 +519,19 @@ def add_new_movie_to_user(user_id):
                     flash(f"Could not add the movie '{movie_data['title']}' to the database. 🌵",
                           'error')
 
-                return redirect(url_for('add_new_movie_to_user', user_id=user_id))
+                return redirect(url_for('main.add_new_movie_to_user', user_id=user_id))
 
     except Exception as e:
-        app.logger.error(f"An unexpected error occurred while adding a new movie to user {user_id}: "
-                         f"{e}")
+        current_app.logger.error(f"An unexpected error occurred while adding a new movie to user "
+                                 f"{user_id}: {e}")
         flash("An unexpected error occurred. Please try again later. 🐉", 'error')
-        return redirect(url_for('list_users'))
+        return redirect(url_for('main.list_users'))
 
     return render_template('add_new_movie_to_user.html',
                            movie_data={}, user=user, user_id=user_id)
 
 
-@app.route('/users/<int:user_id>/add_user_movie', methods=['GET', 'POST'])
+@bp.route('/users/<int:user_id>/add_user_movie', methods=['GET', 'POST'])
 def add_existing_movie_to_user(user_id):
     """
     Add an existing movie from the database to a specific user.
@@ -292,7 +549,7 @@ def add_existing_movie_to_user(user_id):
 
         if not user:
             flash(f"User with ID {user_id} not found. 📺", 'error')
-            return redirect(url_for('list_users'))
+            return redirect(url_for('main.list_users'))
 
         # Fetch all movies to display in the dropdown
         movies = data_manager.get_all_movies()
@@ -312,26 +569,26 @@ def add_existing_movie_to_user(user_id):
             else:
                 flash("Please select a movie to add. 🦄", 'error')
 
-            return redirect(url_for('add_existing_movie_to_user', user_id=user_id))
+            return redirect(url_for('main.add_existing_movie_to_user', user_id=user_id))
 
     except Exception as e:
-        app.logger.error(f"An error occurred while adding an existing movie to user {user_id}: {e}")
+        current_app.logger.error(f"An error occurred while adding an existing movie to user {user_id}: {e}")
         flash("An unexpected error occurred. Please try again later. 👽", 'error')
-        return redirect(url_for('list_users'))
+        return redirect(url_for('main.list_users'))
 
     # Render a form to allow the user to select a movie
     return render_template('add_existing_movie_to_user.html',
                            user=user, movies=movies)
 
 
-@app.route('/movies/<int:movie_id>/edit', methods=['GET', 'POST'])
+@bp.route('/movies/<int:movie_id>/edit', methods=['GET', 'POST'])
 def update_movie(movie_id):
     try:
         movie = data_manager.get_movie_by_id(movie_id)
 
         if not movie:
             flash('Movie not found. 🪓', 'error')
-            return redirect(url_for('list_movies'))
+            return redirect(url_for('main.list_movies'))
 
         if request.method == 'POST':
             # Get updated data from the form
@@ -355,18 +612,18 @@ def update_movie(movie_id):
                 flash(f"Failed to update movie '{updated_data['title']}' 🥁",
                       'error')
 
-            return redirect(url_for('list_movies'))
+            return redirect(url_for('main.list_movies'))
 
     except Exception as e:
-        app.logger.error(f"Error updating movie with ID {movie_id}: {e}")
+        current_app.logger.error(f"Error updating movie with ID {movie_id}: {e}")
         flash("An unexpected error occurred while updating the movie. "
               "Please try again later. 🥨", 'error')
-        return redirect(url_for('list_movies'))
+        return redirect(url_for('main.list_movies'))
 
     return render_template('update_movie.html', movie=movie)
 
 
-@app.route('/movies/<int:movie_id>/delete_movie', methods=['POST'])
+@bp.route('/movies/<int:movie_id>/delete_movie', methods=['POST'])
 def delete_movie(movie_id):
     """
     Delete a movie from the database.
@@ -385,15 +642,15 @@ def delete_movie(movie_id):
             flash(f"Movie with ID {movie_id} could not be deleted. ☔", 'error')
 
     except Exception as e:
-        app.logger.error(f"Error deleting movie with ID {movie_id}: {e}")
+        current_app.logger.error(f"Error deleting movie with ID {movie_id}: {e}")
         flash('An error occurred while deleting the movie. Please try again later. 🌽',
               'error')
 
     # Redirect to the list of movies after deletion
-    return redirect(url_for('list_movies'))
+    return redirect(url_for('main.list_movies'))
 
 
-@app.route('/users/<int:user_id>/remove_movie/<int:movie_id>', methods=['POST'])
+@bp.route('/users/<int:user_id>/remove_movie/<int:movie_id>', methods=['POST'])
 def remove_movie_from_user(user_id, movie_id):
     """
     Remove a movie from a specific user's collection.
@@ -413,15 +670,15 @@ def remove_movie_from_user(user_id, movie_id):
             flash(f"Could not delete movie from user {user_id}. 🐌", 'error')
 
     except Exception as e:
-        app.logger.error(f"Error removing movie with ID {movie_id} from user {user_id}: {e}")
+        current_app.logger.error(f"Error removing movie with ID {movie_id} from user {user_id}: {e}")
         flash('An error occurred while removing the movie from the user. '
               'Please try again later. 🍸', 'error')
 
     # Stay on the user's movie list page, where the action was triggered
-    return redirect(url_for('user_movies', user_id=user_id))
+    return redirect(url_for('main.user_movies', user_id=user_id))
 
 
-@app.route('/users/<int:user_id>/delete_user', methods=['POST'])
+@bp.route('/users/<int:user_id>/delete_user', methods=['POST'])
 def delete_user(user_id):
     """
     Delete a user from the database.
@@ -439,15 +696,15 @@ def delete_user(user_id):
             flash(f"User with ID {user_id} could not be deleted. 🦤", 'error')
 
     except Exception as e:
-        app.logger.error(f"Error deleting user with ID {user_id}: {e}")
+        current_app.logger.error(f"Error deleting user with ID {user_id}: {e}")
         flash('An error occurred while deleting the user. Please try again later. 🌭',
               'error')
 
     # Redirect to the list of users after deletion
-    return redirect(url_for('list_users'))
+    return redirect(url_for('main.list_users'))
 
 
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def page_not_found(e):
     """
     Handle 404 (Page Not Found) errors.
@@ -456,11 +713,11 @@ def page_not_found(e):
     Returns:
         Response: Render the 404 error page template with the status code 404.
     """
-    app.logger.warning(f"404 error occurred: {e}")
+    current_app.logger.warning(f"404 error occurred: {e}")
     return render_template('404.html'), 404
 
 
-@app.errorhandler(500)
+@bp.app_errorhandler(500)
 def internal_server_error(e):
     """
     Handle 500 (Internal Server Error) errors.
@@ -470,9 +727,9 @@ def internal_server_error(e):
         Response: Render the 500 error page template with the status code 500.
     """
     # Log the error for debugging purposes
-    app.logger.error(f"Server error: {e}, route: {request.url}")
+    current_app.logger.error(f"Server error: {e}, route: {request.url}")
     return render_template('500.html'), 500
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    create_app().run(host='0.0.0.0', port=5000, debug=False)
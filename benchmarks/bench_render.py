@@ -0,0 +1,142 @@
+"""
+The bench_render.py script measures template rendering for large list pages.
+It reports the first render in a cold worker, each variant in a fresh interpreter like
+bench_startup.py, and the steady-state render time and per-row cost for pages with many rows.
+The cold-worker variants are:
+- source: nothing cached, the templates are parsed and compiled on the first request
+- bytecode cache: compiled templates are loaded from a warm TEMPLATE_CACHE_DIR on first use
+- precompiled: create_app() loads every template up front, as a preforked worker inherits them
+
+Usage:
+    python benchmarks/bench_render.py [--rows 10000] [--repeat 5] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from flask import render_template   # noqa: E402
+from app import create_app          # noqa: E402
+
+
+# Runs inside a fresh interpreter, so neither the templates nor Jinja itself are warmed up
+# by an earlier variant
+FIRST_RENDER_SCRIPT = '''
+import json, sys, time
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {benchmarks!r})
+from flask import render_template
+from app import create_app
+from bench_render import make_movies
+
+app = create_app({config!r})
+movies = make_movies(10)
+with app.test_request_context('/movies'):
+    started = time.perf_counter()
+    render_template('movies.html', movies=movies)
+    print(json.dumps({{'first_render_ms': (time.perf_counter() - started) * 1000}}))
+'''
+
+
+def make_movies(count):
+    """
+    Build stand-in movie rows with the attributes the templates read.
+    """
+    return [SimpleNamespace(movie_id=i, title=f'Movie {i}', director=f'Director {i % 500}',
+                            release_year=1950 + i % 75, movie_rating=round(i % 100 / 10, 1))
+            for i in range(1, count + 1)]
+
+
+def make_users(count):
+    """
+    Build stand-in user rows with the attributes the templates read.
+    """
+    return [SimpleNamespace(user_id=i, user_name=f'user{i}') for i in range(1, count + 1)]
+
+
+def timed_render(app, path, template, **context):
+    """
+    Render a template inside a request context and return the elapsed milliseconds and output size.
+    """
+    with app.test_request_context(path):
+        started = time.perf_counter()
+        html = render_template(template, **context)
+        return (time.perf_counter() - started) * 1000, len(html)
+
+
+def first_render_in_fresh_worker(config):
+    """
+    Create the app in a new interpreter and return the milliseconds of its first movies.html render.
+    """
+    script = FIRST_RENDER_SCRIPT.format(root=ROOT_DIR, benchmarks=os.path.join(ROOT_DIR, 'benchmarks'),
+                                        config=config)
+    output = subprocess.run([sys.executable, '-c', script], check=True,
+                            capture_output=True, text=True, cwd=ROOT_DIR).stdout
+    return json.loads(output.strip().splitlines()[-1])['first_render_ms']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure MoviWeb template rendering.')
+    parser.add_argument('--rows', type=int, default=10000, help='rows per list page')
+    parser.add_argument('--repeat', type=int, default=5, help='renders per page for the median')
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per cold-worker variant')
+    args = parser.parse_args()
+
+    movies = make_movies(args.rows)
+    users = make_users(args.rows)
+    pages = [
+        ('/movies', 'movies.html', {'movies': movies}),
+        ('/users', 'users.html', {'users': users}),
+        ('/users/1', 'user_movies.html', {'user': users[0], 'movies': movies}),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        base_config = {
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(tmp_dir, 'bench.sqlite'),
+            'LOG_DIR': os.path.join(tmp_dir, 'logs'),
+            'TEMPLATE_CACHE_DIR': os.path.join(tmp_dir, 'templates'),
+        }
+
+        warm_cache_dir = os.path.join(tmp_dir, 'warm-templates')
+        variants = [
+            ('source', lambda run: {'TEMPLATE_PRECOMPILE': False,
+                                    'TEMPLATE_CACHE_DIR': os.path.join(tmp_dir, f'empty-{run}')}),
+            ('bytecode cache', lambda run: {'TEMPLATE_PRECOMPILE': False,
+                                            'TEMPLATE_CACHE_DIR': warm_cache_dir}),
+            ('precompiled', lambda run: {'TEMPLATE_PRECOMPILE': True,
+                                         'TEMPLATE_CACHE_DIR': warm_cache_dir}),
+        ]
+        # Fill the shared bytecode cache once, before any variant that expects it warm
+        first_render_in_fresh_worker({**base_config, 'TEMPLATE_PRECOMPILE': True,
+                                      'TEMPLATE_CACHE_DIR': warm_cache_dir})
+
+        print("first movies.html render in a cold worker (fresh interpreter per run):")
+        for name, variant_config in variants:
+            samples = [first_render_in_fresh_worker({**base_config, **variant_config(run)})
+                       for run in range(args.runs)]
+            print(f"  {name:<16} median {statistics.median(samples):8.2f} ms   max {max(samples):8.2f} ms")
+
+        app = create_app(base_config)
+
+        print(f"\nlist pages with {args.rows} rows:")
+        for path, template, context in pages:
+            samples = []
+            for _ in range(args.repeat):
+                elapsed, size = timed_render(app, path, template, **context)
+                samples.append(elapsed)
+            median = statistics.median(samples)
+            print(f"  {template:<18} median {median:9.2f} ms   {median * 1000 / args.rows:7.2f} us/row"
+                  f"   {size / 1024:8.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
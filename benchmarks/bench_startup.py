@@ -0,0 +1,91 @@
+"""
+The bench_startup.py script measures how long the MoviWeb app takes to boot.
+Each run starts a fresh interpreter and reports the time to import app.py, the time of
+create_app() against a new and an existing database, and the time a forked worker needs
+to serve its first request.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside a fresh interpreter, so module caches from earlier runs cannot skew the numbers
+CHILD_SCRIPT = '''
+import json, os, sys, time
+sys.path.insert(0, {root!r})
+database_uri = 'sqlite:///' + {db_path!r}
+
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app({{'SQLALCHEMY_DATABASE_URI': database_uri, 'LOG_DIR': {log_dir!r}}})
+created = time.perf_counter()
+
+read_fd, write_fd = os.pipe()
+forked = time.perf_counter()
+pid = os.fork()
+if pid == 0:
+    os.close(read_fd)
+    status = app.test_client().get('/').status_code
+    os.write(write_fd, json.dumps({{'status': status, 'done': time.perf_counter()}}).encode())
+    os._exit(0)
+os.close(write_fd)
+child = json.loads(os.read(read_fd, 1024))
+os.waitpid(pid, 0)
+
+print(json.dumps({{
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'fork_first_request_ms': (child['done'] - forked) * 1000,
+    'first_request_status': child['status'],
+}}))
+'''
+
+
+def run_once(db_path, log_dir):
+    """
+    Boot the app in a new interpreter and return its timings in milliseconds.
+    """
+    script = CHILD_SCRIPT.format(root=ROOT_DIR, db_path=db_path, log_dir=log_dir)
+    output = subprocess.run([sys.executable, '-c', script], check=True,
+                            capture_output=True, text=True, cwd=ROOT_DIR).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(label, samples):
+    """
+    Print the median and worst case of a list of timings.
+    """
+    print(f"{label:<28} median {statistics.median(samples):8.2f} ms   max {max(samples):8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure MoviWeb startup time.')
+    parser.add_argument('--runs', type=int, default=10, help='number of warm runs to average')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'bench.sqlite')
+        log_dir = os.path.join(tmp_dir, 'logs')
+
+        # The first run creates the schema, later runs only read the schema version
+        cold = run_once(db_path, log_dir)
+        warm = [run_once(db_path, log_dir) for _ in range(args.runs)]
+
+    print(f"cold create_app (new database): {cold['create_app_ms']:.2f} ms")
+    summarize('import app.py', [run['import_ms'] for run in warm])
+    summarize('create_app (existing db)', [run['create_app_ms'] for run in warm])
+    summarize('fork to first response', [run['fork_first_request_ms'] for run in warm])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,384 @@
+"""
+The loadtest.py script drives a realistic traffic mix against a running MoviWeb server and reports
+throughput, latency percentiles, latency histograms and errors per route.
+
+The mix covers browsing (home, movie and user lists), looking up a user's favourites and the
+movie picker, adding movies (which goes through OMDb) and toggling favourites. Writes compete
+for the SQLite write lock. The app reports a failed write, for example an OMDb error or
+'database is locked', as a redirect with an 'error' flash rather than a 5xx. So the harness follows
+every redirect, as a browser would, and counts the request as an error when the page it lands on
+shows an 'alert-error' message, labelled with the redirect target. The follow-up GETs are reported
+as a route of their own. Lock contention therefore shows up as rising POST latency and as these errors.
+
+With --spawn the script starts its own server (Flask threaded server or gunicorn) on a throwaway
+database, together with the OMDb stub from omdb_stub.py, and stops both at the end.
+
+Usage:
+    python benchmarks/loadtest.py --spawn gunicorn --concurrency 32 --duration 60
+    python benchmarks/loadtest.py --url http://127.0.0.1:5000 --concurrency 16
+"""
+
+import argparse
+import bisect
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from omdb_stub import start_omdb_stub   # noqa: E402
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Relative weights of the scenarios, replaced as a whole by --mix
+DEFAULT_MIX = {'browse': 50, 'lookup': 20, 'add_movie': 10, 'toggle_favourite': 20}
+
+USER_ID_PATTERN = re.compile(r'/users/(\d+)/delete_user')
+MOVIE_ID_PATTERN = re.compile(r'/movies/(\d+)/edit')
+FAVOURITE_ID_PATTERN = re.compile(r'/remove_movie/(\d+)')
+
+
+class RouteStats:
+    """
+    Latencies and errors collected for one route, shared by all worker threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies_ms = []
+        self.errors = defaultdict(int)
+
+    def record(self, latency_ms, error=None):
+        with self._lock:
+            self.latencies_ms.append(latency_ms)
+            if error:
+                self.errors[error] += 1
+
+    def histogram(self):
+        counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for latency in self.latencies_ms:
+            counts[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, latency)] += 1
+        return counts
+
+
+class LoadTest:
+    """
+    Run the scenario mix from a number of threads, each with its own HTTP session.
+    """
+
+    def __init__(self, base_url, concurrency, duration, mix, seed_users, seed_movies):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.duration = duration
+        self.scenarios = list(mix)
+        self.weights = [mix[name] for name in self.scenarios]
+        self.seed_users = seed_users
+        self.seed_movies = seed_movies
+        self.stats = defaultdict(RouteStats)
+        self.user_ids = []
+        self.movie_ids = []
+        # Favourites as the server should have them, shared by all threads
+        self.favourites = set()
+        self.toggling = set()
+        self.favourites_lock = threading.Lock()
+
+    def request(self, session, method, route, path, **kwargs):
+        """
+        Send one request and record it under 'route'. A status of 400 or above counts as an error.
+        A redirect is followed by a separate GET, recorded under 'GET (redirect target)', so the
+        request itself is measured on its own. If the page it lands on shows an error flash,
+        the request counts as an error too.
+        Returns:
+            str: The error label, None if the request succeeded.
+        """
+        started = time.perf_counter()
+        error = None
+        response = None
+        try:
+            response = session.request(method, self.base_url + path, allow_redirects=False,
+                                       timeout=30, **kwargs)
+            if response.status_code >= 400:
+                error = f'HTTP {response.status_code}'
+        except requests.exceptions.RequestException as req_err:
+            error = type(req_err).__name__
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        if error is None and response.is_redirect:
+            location = urljoin(response.url, response.headers['Location'])
+            if self.redirect_shows_error(session, location):
+                error = f'error flash -> {urlparse(location).path}'
+        self.stats[f'{method} {route}'].record(latency_ms, error)
+        # Drop the session, so flash messages a failed follow-up did not read cannot pile up in it
+        session.cookies.clear()
+        return error
+
+    def redirect_shows_error(self, session, location):
+        """
+        Load the page a request redirected to, and tell whether it shows an error flash.
+        """
+        started = time.perf_counter()
+        error = None
+        shows_error = False
+        try:
+            response = session.get(location, allow_redirects=False, timeout=30)
+            if response.status_code >= 400:
+                error = f'HTTP {response.status_code}'
+            shows_error = 'alert-error' in response.text
+        except requests.exceptions.RequestException as req_err:
+            error = type(req_err).__name__
+        self.stats['GET (redirect target)'].record((time.perf_counter() - started) * 1000, error)
+        return shows_error
+
+    def seed(self):
+        """
+        Make sure there are users and movies to work with, then collect their IDs.
+        """
+        session = requests.Session()
+        for i in range(self.seed_users):
+            session.post(f'{self.base_url}/add_user', data={'user_name': f'loadtest-user-{i}'},
+                         allow_redirects=False)
+        for i in range(self.seed_movies):
+            session.post(f'{self.base_url}/add_movie', data={'title': f'Load Test Movie {i}'},
+                         allow_redirects=False)
+
+        self.user_ids = [int(i) for i in USER_ID_PATTERN.findall(session.get(f'{self.base_url}/users').text)]
+        self.movie_ids = [int(i) for i in MOVIE_ID_PATTERN.findall(session.get(f'{self.base_url}/movies').text)]
+        if not self.user_ids or not self.movie_ids:
+            raise RuntimeError('Seeding failed, no users or movies found. Is the OMDb stub reachable?')
+
+        # Start from the favourites the server already has, so toggling them is not counted as failing
+        for user_id in self.user_ids:
+            page = session.get(f'{self.base_url}/users/{user_id}').text
+            self.favourites.update((user_id, int(i)) for i in FAVOURITE_ID_PATTERN.findall(page))
+
+    def browse(self, session, state):
+        path = random.choice(['/', '/movies', '/users'])
+        self.request(session, 'GET', path, path)
+
+    def lookup(self, session, state):
+        user_id = random.choice(self.user_ids)
+        if random.random() < 0.5:
+            self.request(session, 'GET', '/users/<id>', f'/users/{user_id}')
+        else:
+            self.request(session, 'GET', '/users/<id>/add_user_movie', f'/users/{user_id}/add_user_movie')
+
+    def add_movie(self, session, state):
+        state['added'] += 1
+        title = f"Load Test Movie {threading.get_ident()}-{state['added']}"
+        self.request(session, 'POST', '/add_movie', '/add_movie', data={'title': title})
+
+    def toggle_favourite(self, session, state):
+        """
+        Add or remove a favourite, based on the state shared by all threads. A pair is only
+        toggled by one thread at a time, so a duplicate add or a missing remove is a real
+        failure of the server and is counted as one.
+        """
+        pair = (random.choice(self.user_ids), random.choice(self.movie_ids))
+        with self.favourites_lock:
+            if pair in self.toggling:
+                return
+            self.toggling.add(pair)
+            remove = pair in self.favourites
+
+        user_id, movie_id = pair
+        error = None
+        try:
+            if remove:
+                error = self.request(session, 'POST', '/users/<id>/remove_movie/<id>',
+                                     f'/users/{user_id}/remove_movie/{movie_id}')
+            else:
+                error = self.request(session, 'POST', '/users/<id>/add_user_movie',
+                                     f'/users/{user_id}/add_user_movie', data={'movie_id': movie_id})
+        finally:
+            with self.favourites_lock:
+                self.toggling.discard(pair)
+                if error is None:
+                    if remove:
+                        self.favourites.discard(pair)
+                    else:
+                        self.favourites.add(pair)
+
+    def worker(self, deadline):
+        session = requests.Session()
+        state = {'added': 0}
+        while time.monotonic() < deadline:
+            scenario = random.choices(self.scenarios, self.weights)[0]
+            getattr(self, scenario)(session, state)
+
+    def run(self):
+        """
+        Seed the data, run the workers until the duration is over and return the elapsed seconds.
+        """
+        self.seed()
+        started = time.monotonic()
+        deadline = started + self.duration
+        threads = [threading.Thread(target=self.worker, args=(deadline,)) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.monotonic() - started
+
+    def report(self, elapsed):
+        """
+        Summarize the collected stats per route and overall.
+        """
+        routes = {}
+        for route, stats in sorted(self.stats.items()):
+            latencies = sorted(stats.latencies_ms)
+            # 'inclusive' keeps the percentiles within the observed range, so p99 never exceeds max
+            if len(latencies) > 1:
+                quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+            else:
+                quantiles = latencies * 99
+            routes[route] = {
+                'requests': len(latencies),
+                'errors': dict(stats.errors),
+                'throughput_rps': len(latencies) / elapsed,
+                'p50_ms': quantiles[49],
+                'p95_ms': quantiles[94],
+                'p99_ms': quantiles[98],
+                'max_ms': latencies[-1],
+                'histogram': dict(zip([f'<={bound}ms' for bound in HISTOGRAM_BOUNDS_MS] + ['>5000ms'],
+                                      stats.histogram())),
+            }
+        total = sum(route['requests'] for route in routes.values())
+        return {
+            'elapsed_s': elapsed,
+            'concurrency': self.concurrency,
+            'requests': total,
+            'errors': sum(sum(route['errors'].values()) for route in routes.values()),
+            'throughput_rps': total / elapsed,
+            'routes': routes,
+        }
+
+
+def print_report(report):
+    print(f"\n{report['requests']} requests in {report['elapsed_s']:.1f} s with {report['concurrency']} threads: "
+          f"{report['throughput_rps']:.1f} req/s, {report['errors']} errors\n")
+    print(f"{'route':<36} {'reqs':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  errors")
+    for name, route in report['routes'].items():
+        errors = ', '.join(f'{kind}: {count}' for kind, count in route['errors'].items()) or '-'
+        print(f"{name:<36} {route['requests']:>7} {route['throughput_rps']:>8.1f} {route['p50_ms']:>8.1f} "
+              f"{route['p95_ms']:>8.1f} {route['p99_ms']:>8.1f} {route['max_ms']:>8.1f}  {errors}")
+
+    print('\nlatency histograms (requests per bucket, upper bound in ms):')
+    print(f"{'route':<36} " + ' '.join(f'{bound:>6}' for bound in HISTOGRAM_BOUNDS_MS) + f" {'more':>6}")
+    for name, route in report['routes'].items():
+        print(f'{name:<36} ' + ' '.join(f'{count:>6}' for count in route['histogram'].values()))
+
+
+def spawn_server(kind, port, workers, stub_url, tmp_dir):
+    """
+    Start the app on a throwaway database, with OMDb lookups going to the stub.
+    Returns:
+        subprocess.Popen: The server process.
+    """
+    env = {
+        **os.environ,
+        'DATABASE_URL': 'sqlite:///' + os.path.join(tmp_dir, 'loadtest.sqlite'),
+        'LOG_DIR': os.path.join(tmp_dir, 'logs'),
+        'TEMPLATE_CACHE_DIR': os.path.join(tmp_dir, 'templates'),
+        'OMDB_API_URL': stub_url,
+        'API_KEY': 'loadtest',
+    }
+    if kind == 'gunicorn':
+        env.update(GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS=str(workers))
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py']
+    else:
+        command = [sys.executable, '-c',
+                   f"from app import create_app; create_app().run(host='127.0.0.1', port={port}, threaded=True)"]
+    return subprocess.Popen(command, cwd=ROOT_DIR, env=env)
+
+
+def wait_until_ready(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f'{base_url}/healthz', timeout=1).status_code == 200:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'Server at {base_url} did not become healthy within {timeout} s')
+
+
+def parse_mix(value):
+    """
+    Parse 'browse=50,lookup=20,...' into scenario weights. Scenarios that are not listed do not run.
+    """
+    mix = dict.fromkeys(DEFAULT_MIX, 0.0)
+    for part in filter(None, value.split(',')):
+        name, weight = part.split('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f'unknown scenario {name!r}, expected one of {", ".join(DEFAULT_MIX)}')
+        mix[name] = float(weight)
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError('at least one scenario needs a positive weight')
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test a MoviWeb server.')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='server to test, ignored with --spawn')
+    parser.add_argument('--spawn', choices=['flask', 'gunicorn'], help='start a local server and OMDb stub')
+    parser.add_argument('--port', type=int, default=5055, help='port of the spawned server')
+    parser.add_argument('--server-workers', type=int, default=os.cpu_count() or 1,
+                        help='gunicorn workers of the spawned server')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds of load')
+    parser.add_argument('--mix', type=parse_mix, default=dict(DEFAULT_MIX),
+                        help='scenario weights replacing the default mix, unlisted scenarios do not run, '
+                             'e.g. browse=50,lookup=20,add_movie=10,toggle_favourite=20')
+    parser.add_argument('--seed-users', type=int, default=20)
+    parser.add_argument('--seed-movies', type=int, default=50)
+    parser.add_argument('--omdb-latency-ms', type=float, default=150.0)
+    parser.add_argument('--omdb-jitter-ms', type=float, default=50.0)
+    parser.add_argument('--omdb-error-rate', type=float, default=0.0)
+    parser.add_argument('--json', metavar='PATH', help='also write the report as JSON')
+    args = parser.parse_args()
+
+    base_url = args.url
+    stub = server = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            if args.spawn:
+                stub = start_omdb_stub(port=0, latency_ms=args.omdb_latency_ms,
+                                       jitter_ms=args.omdb_jitter_ms, error_rate=args.omdb_error_rate)
+                stub_url = f'http://127.0.0.1:{stub.server_port}/'
+                server = spawn_server(args.spawn, args.port, args.server_workers, stub_url, tmp_dir)
+                base_url = f'http://127.0.0.1:{args.port}'
+            wait_until_ready(base_url)
+
+            load_test = LoadTest(base_url, args.concurrency, args.duration, args.mix,
+                                 args.seed_users, args.seed_movies)
+            report = load_test.report(load_test.run())
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=60)
+            if stub is not None:
+                stub.shutdown()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
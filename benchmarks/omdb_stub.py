@@ -0,0 +1,109 @@
+"""
+The omdb_stub.py script serves a stand-in for the OMDb API, so load tests neither need an API key
+nor hit the real service. Any title is "found" unless an error or a miss is simulated.
+Point the app at it with OMDB_API_URL=http://<host>:<port>/
+
+Usage:
+    python benchmarks/omdb_stub.py [--port 8081] [--latency-ms 150] [--jitter-ms 50]
+                                   [--error-rate 0.01] [--not-found-rate 0.05]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class OmdbStubHandler(BaseHTTPRequestHandler):
+    """
+    Answer OMDb title lookups ('?t=<title>') after a simulated delay.
+    The settings are read from the server, see start_omdb_stub().
+    """
+
+    def do_GET(self):
+        settings = self.server.settings
+        delay = max(0.0, random.gauss(settings['latency_ms'], settings['jitter_ms'])) / 1000
+        time.sleep(delay)
+
+        roll = random.random()
+        if roll < settings['error_rate']:
+            self._send_json(503, {'Response': 'False', 'Error': 'Simulated upstream error.'})
+            return
+
+        title = parse_qs(urlparse(self.path).query).get('t', [''])[0]
+        if not title or roll < settings['error_rate'] + settings['not_found_rate']:
+            self._send_json(200, {'Response': 'False', 'Error': 'Movie not found!'})
+            return
+
+        # Derive stable details from the title, so repeated lookups agree
+        digest = int(hashlib.sha256(title.encode()).hexdigest(), 16)
+        self._send_json(200, {
+            'Title': title,
+            'Director': f'Director {digest % 1000}',
+            'Year': str(1950 + digest % 75),
+            'imdbRating': f'{1 + digest % 90 / 10:.1f}',
+            'Response': 'True',
+        })
+
+    def do_HEAD(self):
+        # Used by the app's /readyz reachability check
+        self.send_response(200)
+        self.end_headers()
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass    # one line per request would drown the load test output
+
+
+def start_omdb_stub(host='127.0.0.1', port=8081, latency_ms=150.0, jitter_ms=50.0,
+                    error_rate=0.0, not_found_rate=0.0):
+    """
+    Start the stub on a background thread.
+    Returns:
+        ThreadingHTTPServer: The running server, stop it with shutdown().
+    """
+    server = ThreadingHTTPServer((host, port), OmdbStubHandler)
+    server.daemon_threads = True
+    server.settings = {
+        'latency_ms': latency_ms,
+        'jitter_ms': jitter_ms,
+        'error_rate': error_rate,
+        'not_found_rate': not_found_rate,
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a stand-in for the OMDb API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency-ms', type=float, default=150.0, help='mean response delay')
+    parser.add_argument('--jitter-ms', type=float, default=50.0, help='standard deviation of the delay')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of 503 answers')
+    parser.add_argument('--not-found-rate', type=float, default=0.0, help='fraction of "Movie not found!" answers')
+    args = parser.parse_args()
+
+    server = start_omdb_stub(args.host, args.port, args.latency_ms, args.jitter_ms,
+                             args.error_rate, args.not_found_rate)
+    print(f"OMDb stub listening on http://{args.host}:{server.server_port}/")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,8 +5,44 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'mysecretkey')
 
     basedir = os.path.abspath(os.path.dirname(__file__))
-    os.makedirs(os.path.join(basedir, 'data'), exist_ok=True)
+    # The data directory is created by SQLiteDataManager.ensure_schema(), not at import time
     db_path = os.path.join(basedir, 'data', 'moviweb.sqlite')
 
-    SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+    # DATABASE_URL lets a test or load-test server run against a throwaway database
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', f'sqlite:///{db_path}')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Run the one-time, version-guarded schema check inside create_app()
+    SCHEMA_CHECK_ON_STARTUP = os.getenv('SCHEMA_CHECK_ON_STARTUP', '1') == '1'
+
+    # OMDb API, the URL can point to a local stub for load tests
+    OMDB_API_URL = os.getenv('OMDB_API_URL', 'http://www.omdbapi.com/')
+    OMDB_TIMEOUT = float(os.getenv('OMDB_TIMEOUT', 5))
+    # The reachability check behind /readyz is cached per worker for OMDB_HEALTH_TTL seconds
+    OMDB_HEALTH_TTL = float(os.getenv('OMDB_HEALTH_TTL', 30))
+    OMDB_HEALTH_TIMEOUT = float(os.getenv('OMDB_HEALTH_TIMEOUT', 1))
+
+    # /readyz answers 503 once a worker serves this many requests (0 disables the check)
+    READYZ_MAX_IN_FLIGHT = int(os.getenv('READYZ_MAX_IN_FLIGHT', 0))
+    READYZ_REQUIRE_OMDB = os.getenv('READYZ_REQUIRE_OMDB', '0') == '1'
+
+    # Rendered HTML of at least this many bytes is gzipped for clients that accept it
+    HTML_GZIP_MIN_SIZE = int(os.getenv('HTML_GZIP_MIN_SIZE', 1024))
+    HTML_GZIP_LEVEL = int(os.getenv('HTML_GZIP_LEVEL', 6))
+
+    # Compiled templates are cached on disk and all templates are compiled inside create_app()
+    TEMPLATE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR')
+    TEMPLATE_PRECOMPILE = os.getenv('TEMPLATE_PRECOMPILE', '1') == '1'
+
+    # Default and maximum number of entries returned by one /api/changes call
+    CHANGES_PAGE_SIZE = int(os.getenv('CHANGES_PAGE_SIZE', 500))
+    CHANGES_MAX_PAGE_SIZE = int(os.getenv('CHANGES_MAX_PAGE_SIZE', 5000))
+
+    # Logging: JSON lines written from a background thread, see config/logging_config.py
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_DIR = os.getenv('LOG_DIR')
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'midnight')
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 7))
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    # Fraction of INFO records kept, warnings and errors are never sampled out
+    LOG_INFO_SAMPLE_RATE = float(os.getenv('LOG_INFO_SAMPLE_RATE', 1.0))
@@ -1,24 +1,265 @@
+import atexit
+import copy
+import json
 import logging
-from flask import Flask
 import os
+import queue
+import random
+import time
+import uuid
+import weakref
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from flask import Flask, g, has_request_context, request
+from flask.logging import default_handler
+
+try:
+    import fcntl
+except ImportError:     # Windows, where no worker is ever forked
+    fcntl = None
+
+# Apps whose log listener is running, the only ones restarted in a forked child
+_logging_apps = weakref.WeakSet()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line.
+    The request fields are attached to the record on the request thread by RequestContextFilter,
+    so the background thread only has to serialize them.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+            'route': getattr(record, 'route', None),
+            'latency_ms': getattr(record, 'latency_ms', None),
+        }
+        if record.levelno >= logging.ERROR:
+            entry['location'] = f'{record.pathname}:{record.lineno}'
+        # Filled by NonBlockingQueueHandler.prepare(), exc_info itself does not cross the queue
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """
+    Rotate the log file at a fixed time interval or once it grows past max_bytes,
+    whichever comes first.
+    The forked gunicorn workers all append to the same file. A rotation holds an exclusive
+    lock on '<file>.lock', and a process whose file was already rotated by another one
+    reopens the new file before its next write instead of rotating again, like
+    WatchedFileHandler. A record written in the short window between another process's
+    rotation and the reopen lands at the end of the newest backup.
+    """
+
+    def __init__(self, filename, max_bytes=0, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.max_bytes = max_bytes
+        self.lock_filename = self.baseFilename + '.lock'
+
+    def _rotated_elsewhere(self):
+        """
+        Tell whether the open stream no longer is the file at baseFilename.
+        """
+        if self.stream is None:
+            return False
+        try:
+            on_disk = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            return True
+        opened = os.fstat(self.stream.fileno())
+        return (on_disk.st_dev, on_disk.st_ino) != (opened.st_dev, opened.st_ino)
+
+    def _reopen(self):
+        # FileHandler.emit() opens baseFilename again on the next write
+        self.stream.close()
+        self.stream = None
+        self.rolloverAt = self.computeRollover(int(time.time()))
+
+    def shouldRollover(self, record):
+        if self._rotated_elsewhere():
+            self._reopen()
+            return False
+        if super().shouldRollover(record):
+            return True
+        # The size check only looks at what was already written, so a file may exceed
+        # max_bytes by one record, but the record is not formatted twice
+        if self.max_bytes > 0 and self.stream is not None:
+            self.stream.seek(0, os.SEEK_END)
+            if self.stream.tell() >= self.max_bytes:
+                return True
+        return False
+
+    def doRollover(self):
+        if fcntl is None:
+            super().doRollover()
+            return
+
+        with open(self.lock_filename, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another process may have rotated the file while this one waited for the lock
+                if self._rotated_elsewhere():
+                    self._reopen()
+                else:
+                    super().doRollover()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def rotation_filename(self, default_name):
+        # Several size-based rollovers can happen within one time interval, so every backup gets
+        # a fixed-width nanosecond suffix. It keeps backups from overwriting each other and sorts
+        # in creation order, which getFilesToDelete() relies on to remove the oldest ones
+        return super().rotation_filename(f'{default_name}.{time.time_ns():020d}')
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Copy the request id and route onto every record while still on the request thread.
+    """
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.route = request.url_rule.rule if request.url_rule else request.path
+        return True
+
+
+class InfoSamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of INFO (and DEBUG) records, warnings and errors always pass.
+    """
+
+    def __init__(self, sample_rate):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Enqueue records without ever waiting on a full queue, records are dropped instead.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.exception_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        """
+        Merge the message arguments on the request thread, but keep the traceback out of the
+        message: it goes into exc_text, which JsonFormatter writes as a field of its own.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.exception_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
 
 def setup_logging(app: Flask):
+    """
+    Route the app's log records through a queue to a background thread that writes
+    rotating JSON-line files, so request threads never block on log I/O.
+    """
+    app.logger.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+
     if not app.debug:
-        log_dir = os.path.join(os.path.expanduser("~"), 'moviweb_app', 'logs')
+        log_dir = app.config.get('LOG_DIR') or os.path.join(os.path.expanduser("~"), 'moviweb_app', 'logs')
 
         # Ensure the 'logs' directory exists
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir, exist_ok=True)
-            # exist_ok=True: Ensures the directory creation doesn't raise an error if it already exists
+        # exist_ok=True: Ensures the directory creation doesn't raise an error if it already exists
+        os.makedirs(log_dir, exist_ok=True)
 
-        # File handler for logging to 'error.log' in the writable logs directory
-        log_file_path = os.path.join(log_dir, 'error.log')
-        file_handler = logging.FileHandler(log_file_path)
-        file_handler.setLevel(logging.ERROR)
-
-        formatter = logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
+        # File handler for logging to 'app.log' in the writable logs directory,
+        # only ever used from the listener thread
+        file_handler = SizedTimedRotatingFileHandler(
+            os.path.join(log_dir, 'app.log'),
+            max_bytes=app.config.get('LOG_MAX_BYTES', 10 * 1024 * 1024),
+            when=app.config.get('LOG_ROTATE_WHEN', 'midnight'),
+            backupCount=app.config.get('LOG_BACKUP_COUNT', 7),
+            encoding='utf-8',
+            delay=True,
         )
-        file_handler.setFormatter(formatter)
-        app.logger.addHandler(file_handler)
+        file_handler.setFormatter(JsonFormatter())
+
+        queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=app.config.get('LOG_QUEUE_SIZE', 10000)))
+        queue_handler.addFilter(InfoSamplingFilter(app.config.get('LOG_INFO_SAMPLE_RATE', 1.0)))
+        queue_handler.addFilter(RequestContextFilter())
+        app.logger.addHandler(queue_handler)
+        # Flask's default handler writes to stderr on the request thread
+        app.logger.removeHandler(default_handler)
+
+        def start_listener():
+            listener = QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+            listener.start()
+            app.extensions['log_listener'] = listener
+
+        def restart_listener_after_fork():
+            # The listener thread does not survive a fork and its queue may have been locked
+            # mid-operation, so every forked worker gets a fresh queue and thread
+            queue_handler.queue = queue.Queue(maxsize=app.config.get('LOG_QUEUE_SIZE', 10000))
+            start_listener()
+
+        start_listener()
+        app.extensions['log_restart_after_fork'] = restart_listener_after_fork
+        _logging_apps.add(app)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        started = g.get('request_started', time.perf_counter())
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        response.headers['X-Request-ID'] = g.get('request_id', '')
+        app.logger.info(f"{request.method} {request.path} {response.status_code}",
+                        extra={'latency_ms': latency_ms})
+        return response
+
+
+def stop_logging(app: Flask):
+    """
+    Flush the queued log records and stop the listener thread of the app, if any.
+    """
+    _logging_apps.discard(app)
+    listener = app.extensions.pop('log_listener', None)
+    if listener is not None:
+        listener.stop()
+
+
+def _restart_listeners_after_fork():
+    for app in list(_logging_apps):
+        app.extensions['log_restart_after_fork']()
+
+
+def _stop_all_logging():
+    for app in list(_logging_apps):
+        stop_logging(app)
+
+
+# Registered once for the process, rather than once per app, so stopped or discarded
+# apps are neither restarted after a fork nor kept alive until exit
+os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+atexit.register(_stop_all_logging)
@@ -1,3 +1,4 @@
+from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import relationship
 
@@ -40,3 +41,32 @@ class Movie(db.Model):
     def __repr__(self):
         return f"'{self.title}' directed by {self.director}, released on {self.release_year}, rated {self.movie_rating}"
 
+
+class ChangeLog(db.Model):
+    """
+    Append-only record of every write to users, movies and user_movies.
+    Entries are written in the same transaction as the change itself. AUTOINCREMENT keeps
+    seq strictly increasing, even after old entries were compacted away.
+    """
+    __tablename__ = 'change_log'
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    seq = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    operation = db.Column(db.String(10), nullable=False)    # 'insert', 'update' or 'delete'
+    row_key = db.Column(db.JSON, nullable=False)    # primary key columns of the changed row
+    row_data = db.Column(db.JSON)   # the row after the change, None for deletes
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def to_dict(self):
+        return {
+            'seq': self.seq,
+            'table': self.table_name,
+            'operation': self.operation,
+            'key': self.row_key,
+            'data': self.row_data,
+            'changed_at': self.changed_at.isoformat(),
+        }
+
+    def __repr__(self):
+        return f"<ChangeLog(seq={self.seq}, {self.operation} {self.table_name} {self.row_key})>"
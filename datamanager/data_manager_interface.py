@@ -10,6 +10,13 @@ from abc import ABC, abstractmethod
 
 class DataManagerInterface(ABC):
 
+    @abstractmethod
+    def ping(self):
+        """
+        Check that the underlying storage is reachable.
+        """
+        pass
+
     @abstractmethod
     def list_all_users(self):
         """
@@ -87,3 +94,24 @@ class DataManagerInterface(ABC):
         Update a movie in the database.
         """
         pass
+
+    @abstractmethod
+    def get_changes(self, since_seq, limit):
+        """
+        Retrieve the change log entries recorded after a given sequence number.
+        """
+        pass
+
+    @abstractmethod
+    def get_oldest_change_seq(self):
+        """
+        Retrieve the lowest sequence number still kept in the change log.
+        """
+        pass
+
+    @abstractmethod
+    def compact_changes(self, before_seq=None, older_than_days=None):
+        """
+        Delete old change log entries.
+        """
+        pass
@@ -6,8 +6,28 @@ required to perform operations on the database, such as retrieving, adding, dele
 and updating movies for users.
 """
 
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import func, text
 from datamanager.data_manager_interface import DataManagerInterface
-from data_models import db, User, Movie
+from data_models import db, User, Movie, ChangeLog
+
+# Bump whenever a model or table is added or changed, so ensure_schema() runs create_all again
+SCHEMA_VERSION = 2
+
+
+def _user_row(user):
+    return {'user_id': user.user_id, 'user_name': user.user_name}
+
+
+def _movie_row(movie):
+    return {
+        'movie_id': movie.movie_id,
+        'title': movie.title,
+        'director': movie.director,
+        'release_year': movie.release_year,
+        'movie_rating': movie.movie_rating,
+    }
 
 
 class SQLiteDataManager(DataManagerInterface):
@@ -18,13 +38,57 @@ class SQLiteDataManager(DataManagerInterface):
         to be configured and initialized in the context of the Flask application.
         The Flask application context (app) holds the configuration settings necessary for
         SQLAlchemy to connect to the database, manage sessions, and handle requests.
+        No connection is opened here, the schema is checked by ensure_schema().
         """
         self.app = app
         self.db = db    # sqlalchemy object from data_models
         db.init_app(app)    # initialization of the db in the app
+
+    def ensure_schema(self):
+        """
+        Create the tables once per SCHEMA_VERSION instead of running create_all on every start.
+        The applied version is kept in a small 'schema_version' table, so later starts only
+        read one row. The engine is disposed afterwards, so no SQLite connection opened here
+        is inherited by forked workers.
+        """
         with self.app.app_context():
             # 'with' ensures the Flask application context is active for database operations
-            self.db.create_all()    # create all tables
+            engine = self.db.engine
+            database = engine.url.database
+            if database and database != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+
+            with engine.begin() as connection:
+                connection.execute(text(
+                    'CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)'))
+                current = connection.execute(text('SELECT MAX(version) FROM schema_version')).scalar()
+                if current is None or current < SCHEMA_VERSION:
+                    self.db.metadata.create_all(bind=connection)    # create all tables
+                    connection.execute(text('INSERT INTO schema_version (version) VALUES (:version)'),
+                                       {'version': SCHEMA_VERSION})
+                    self.app.logger.info(f"Database schema upgraded to version {SCHEMA_VERSION}")
+
+            engine.dispose()
+
+    def ping(self):
+        """
+        Read the schema version to check that the SQLite database file exists and can be read.
+        A bare 'SELECT 1' would never touch the file, so a missing, locked or corrupt database
+        would still pass.
+        Returns True if it answered, False otherwise.
+        """
+        database = self.db.engine.url.database
+        if database and database != ':memory:' and not os.path.isfile(database):
+            # Connecting would silently create a new, empty database file
+            self.app.logger.error(f"Database health check failed: {database} does not exist")
+            return False
+
+        try:
+            self.db.session.execute(text('SELECT version FROM schema_version LIMIT 1'))
+            return True
+        except Exception as e:
+            self.app.logger.error(f"Database health check failed: {e}")
+            return False
 
     def list_all_users(self):
         """
@@ -59,12 +123,22 @@ class SQLiteDataManager(DataManagerInterface):
 
         return movies
 
+    def _log_change(self, table_name, operation, row_key, row_data=None):
+        """
+        Add a change log entry to the current session.
+        It is committed together with the change it describes, or not at all.
+        """
+        self.db.session.add(ChangeLog(table_name=table_name, operation=operation,
+                                      row_key=row_key, row_data=row_data))
+
     def add_user(self, user_name):
         """
         This method adds a new user to the database.
         """
         new_user = User(user_name=user_name)
         self.db.session.add(new_user)
+        self.db.session.flush()     # assigns new_user.user_id for the change log
+        self._log_change('users', 'insert', {'user_id': new_user.user_id}, _user_row(new_user))
         self.db.session.commit()
         return new_user.user_id  # Return the new user's ID to confirm addition
 
@@ -81,6 +155,10 @@ class SQLiteDataManager(DataManagerInterface):
             movie_rating=movie_data.get('rating')
         )
         self.db.session.add(new_movie)
+        self.db.session.flush()     # assigns new_movie.movie_id for the change log
+        # OMDb values arrive as strings, log them as SQLite stored them
+        self.db.session.refresh(new_movie)
+        self._log_change('movies', 'insert', {'movie_id': new_movie.movie_id}, _movie_row(new_movie))
         self.db.session.commit()
         return new_movie.movie_id   # Return the movie ID to confirm addition
 
@@ -103,12 +181,14 @@ class SQLiteDataManager(DataManagerInterface):
             # Only append the movie if it is not already in the user's movie list
             if movie not in user.movies:
                 user.movies.append(movie)   # This appends the movie to the user's movie list
+                key = {'user_id': user.user_id, 'movie_id': movie.movie_id}
+                self._log_change('user_movies', 'insert', key, key)
                 self.db.session.commit()
                 return True
             else:
-                print("Movie already in user's list")
+                self.app.logger.info(f"Movie {movie_id} already in user {user_id}'s list")
         else:
-            print("User or movie not found")
+            self.app.logger.warning(f"User {user_id} or movie {movie_id} not found")
         return False
 
     def remove_movie_from_user(self, user_id, movie_id):
@@ -122,6 +202,8 @@ class SQLiteDataManager(DataManagerInterface):
                 # This removes the movie from the user's movie list,
                 # rather than trying to delete the movie object directly from the session
                 user.movies.remove(movie)
+                self._log_change('user_movies', 'delete',
+                                 {'user_id': user.user_id, 'movie_id': movie.movie_id})
                 self.db.session.commit()
                 return True
             return False
@@ -130,6 +212,11 @@ class SQLiteDataManager(DataManagerInterface):
         """This method deletes a movie from the database."""
         movie = self.db.session.query(Movie).filter_by(movie_id=movie_id).first()
         if movie:
+            # Deleting the movie also removes it from every user's list
+            for user in movie.users:
+                self._log_change('user_movies', 'delete',
+                                 {'user_id': user.user_id, 'movie_id': movie.movie_id})
+            self._log_change('movies', 'delete', {'movie_id': movie.movie_id})
             self.db.session.delete(movie)
             self.db.session.commit()
             return True
@@ -139,6 +226,11 @@ class SQLiteDataManager(DataManagerInterface):
         """This method deletes a user from the database."""
         user = self.db.session.query(User).filter_by(user_id=user_id).first()
         if user:
+            # Deleting the user also removes their list of movies
+            for movie in user.movies:
+                self._log_change('user_movies', 'delete',
+                                 {'user_id': user.user_id, 'movie_id': movie.movie_id})
+            self._log_change('users', 'delete', {'user_id': user.user_id})
             self.db.session.delete(user)
             self.db.session.commit()
             return True   # Return True to indicate successful deletion
@@ -156,6 +248,49 @@ class SQLiteDataManager(DataManagerInterface):
             movie.director = updated_movie_data.get('director', movie.director)
             movie.release_year = updated_movie_data.get('release_year', movie.release_year)
             movie.movie_rating = updated_movie_data.get('rating', movie.movie_rating)
+            # Form values arrive as strings, log them as SQLite stored them
+            self.db.session.flush()
+            self.db.session.refresh(movie)
+            self._log_change('movies', 'update', {'movie_id': movie.movie_id}, _movie_row(movie))
             self.db.session.commit()
             return True
         return False
+
+    def get_changes(self, since_seq, limit):
+        """
+        Retrieve up to 'limit' change log entries with a sequence number above since_seq,
+        oldest first.
+        """
+        return (self.db.session.query(ChangeLog)
+                .filter(ChangeLog.seq > since_seq)
+                .order_by(ChangeLog.seq)
+                .limit(limit)
+                .all())
+
+    def get_oldest_change_seq(self):
+        """
+        Return the lowest sequence number still in the change log, or None if it is empty.
+        Consumers that are behind this point have missed compacted entries.
+        """
+        return self.db.session.query(func.min(ChangeLog.seq)).scalar()
+
+    def compact_changes(self, before_seq=None, older_than_days=None):
+        """
+        Delete change log entries below before_seq and/or older than older_than_days.
+        The newest entry is always kept, so the sequence stays visible to consumers.
+        Returns the number of deleted entries.
+        """
+        newest_seq = self.db.session.query(func.max(ChangeLog.seq)).scalar()
+        if newest_seq is None or (before_seq is None and older_than_days is None):
+            return 0
+
+        query = self.db.session.query(ChangeLog).filter(ChangeLog.seq < newest_seq)
+        if before_seq is not None:
+            query = query.filter(ChangeLog.seq < before_seq)
+        if older_than_days is not None:
+            cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+            query = query.filter(ChangeLog.changed_at < cutoff)
+
+        deleted = query.delete(synchronize_session=False)
+        self.db.session.commit()
+        return deleted
@@ -0,0 +1,54 @@
+"""
+Production serving settings for the MoviWeb app, read by gunicorn from the working directory:
+
+    gunicorn                      # uses this file and serves app:create_app()
+
+Every setting can be overridden through the environment variables below.
+The app is built once in the master (preload) and forked into the workers, each running
+several threads. Workers are recycled after a number of requests and finish in-flight
+requests on SIGTERM before exiting.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = 'app:create_app()'
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Processes scale with the cores, threads cover the time spent waiting on SQLite and OMDb
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Import the app and run the schema check once, before forking the workers
+preload_app = True
+
+# Recycle workers to bound memory growth, jitter keeps them from restarting all at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Seconds a worker gets to finish its requests after SIGTERM, and before it is considered hung
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+
+def post_fork(server, worker):
+    """
+    Drop any SQLite connection the master may hold, so no connection is shared across the fork.
+    """
+    from data_models import db
+
+    with worker.app.wsgi().app_context():
+        # close=False (SQLAlchemy 2.0) leaves the master's connections alone and only
+        # gives this worker a fresh pool
+        db.engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    """
+    Flush the worker's queued log records before the process goes away.
+    """
+    from config.logging_config import stop_logging
+
+    stop_logging(worker.app.wsgi())
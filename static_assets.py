@@ -0,0 +1,145 @@
+"""
+The static_assets.py file reduces the bandwidth and round-trips spent on static files and pages.
+- url_for('static', ...) URLs get a content-hash fingerprint ('?v=<hash>'), and fingerprinted
+  requests are served with a far-future 'Cache-Control: immutable' header.
+- 'flask --app app build-static' writes gzip (and, when the brotli package is installed, brotli)
+  variants next to the static files, which are served to clients that accept them.
+- Rendered HTML above HTML_GZIP_MIN_SIZE bytes is gzipped on the fly.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import click
+from flask import Flask, current_app, request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:     # brotli is optional, gzip variants are still built and served
+    brotli = None
+
+# Content-Encoding and file suffix of the precompressed variants, in order of preference
+PRECOMPRESSED_VARIANTS = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.html')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def build_manifest(static_folder):
+    """
+    Map the path of every static file, relative to the static folder, to a short hash of its content.
+    """
+    manifest = {}
+    for dir_path, _, file_names in os.walk(static_folder):
+        for file_name in file_names:
+            if file_name.endswith(tuple(suffix for _, suffix in PRECOMPRESSED_VARIANTS)):
+                continue
+            path = os.path.join(dir_path, file_name)
+            with open(path, 'rb') as static_file:
+                digest = hashlib.sha256(static_file.read()).hexdigest()[:12]
+            manifest[os.path.relpath(path, static_folder).replace(os.sep, '/')] = digest
+    return manifest
+
+
+def precompress_static_files(static_folder):
+    """
+    Write '.gz' and '.br' variants for the compressible static files.
+    A variant is only kept if it is smaller than the original.
+    Returns:
+        list: The paths of the written variants.
+    """
+    written = []
+    for relative_path in build_manifest(static_folder):
+        if not relative_path.endswith(COMPRESSIBLE_EXTENSIONS):
+            continue
+        path = os.path.join(static_folder, relative_path)
+        with open(path, 'rb') as static_file:
+            data = static_file.read()
+
+        # mtime=0 keeps the gzip output identical between builds
+        variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(data, mode=brotli.MODE_TEXT)
+
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(data):
+                with open(path + suffix, 'wb') as variant_file:
+                    variant_file.write(compressed)
+                written.append(path + suffix)
+    return written
+
+
+def send_static_asset(filename):
+    """
+    Serve a static file, preferring a precompressed variant the client accepts.
+    Fingerprinted requests whose hash matches the current content are cached for a year.
+    """
+    app = current_app
+    static_folder = app.static_folder
+    original_path = safe_join(static_folder, filename)
+    response = None
+
+    # A missing file falls through to send_static_file, which answers with a 404
+    if original_path is not None and os.path.isfile(original_path):
+        for encoding, suffix in PRECOMPRESSED_VARIANTS:
+            variant_path = original_path + suffix
+            if (request.accept_encodings[encoding] > 0 and os.path.isfile(variant_path)
+                    and os.path.getmtime(variant_path) >= os.path.getmtime(original_path)):
+                # download_name keeps Content-Disposition naming the original asset, not the variant
+                response = send_from_directory(static_folder, filename + suffix,
+                                               mimetype=mimetypes.guess_type(filename)[0],
+                                               download_name=os.path.basename(filename))
+                response.headers['Content-Encoding'] = encoding
+                break
+
+    if response is None:
+        response = app.send_static_file(filename)
+
+    response.vary.add('Accept-Encoding')
+    fingerprint = request.args.get('v')
+    if fingerprint and fingerprint == app.extensions['static_manifest'].get(filename):
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+def init_static_assets(app: Flask):
+    """
+    Register static fingerprinting, precompressed static serving, HTML compression
+    and the build-static command on the app.
+    """
+    app.extensions['static_manifest'] = build_manifest(app.static_folder)
+    app.view_functions['static'] = send_static_asset
+
+    @app.url_defaults
+    def add_static_fingerprint(endpoint, values):
+        if endpoint == 'static' and 'v' not in values:
+            digest = app.extensions['static_manifest'].get(values.get('filename'))
+            if digest:
+                values['v'] = digest
+
+    @app.after_request
+    def compress_html(response):
+        if (response.status_code != 200 or response.mimetype != 'text/html'
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or request.accept_encodings['gzip'] <= 0):
+            return response
+
+        data = response.get_data()
+        if len(data) < app.config['HTML_GZIP_MIN_SIZE']:
+            return response
+
+        response.set_data(gzip.compress(data, compresslevel=app.config['HTML_GZIP_LEVEL']))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    @app.cli.command('build-static')
+    def build_static():
+        """Write precompressed variants of the static files."""
+        for path in precompress_static_files(app.static_folder):
+            click.echo(f"wrote {os.path.relpath(path, app.root_path)}")
+        if brotli is None:
+            click.echo("brotli is not installed, only gzip variants were written")
+        # Pick up any static file changed since the app was created
+        app.extensions['static_manifest'] = build_manifest(app.static_folder)